@@ -16,8 +16,12 @@ Python APRS Gateway.
 """
 
 from .constants import (LOG_FORMAT, LOG_LEVEL, ISS_TLE, BEACON_INTERVAL,  # NOQA
-                        QTH, REJECT_PATHS)
+                        QTH, REJECT_PATHS, FLUSH_SIZE, FLUSH_INTERVAL,
+                        FLUSH_STATS_INTERVAL, BATCH_WAIT, PROFILE_DURATION,
+                        PROFILE_INTERVAL, PROFILE_FUNCTIONS)
 
-from .functions import reject_frame  # NOQA
+from .functions import reject_frame, frame_key  # NOQA
 
 from .classes import GateOut, GateIn, GateWorker, GateBeacon # NOQA
+
+from .profiler import GateProfiler, install_profiler  # NOQA
@@ -3,6 +3,7 @@
 
 """Python APRS Gateway Class Definitions."""
 
+import collections
 import logging
 import logging.handlers
 import threading
@@ -81,12 +82,31 @@ class GateOut(threading.Thread):
         _logger.addHandler(_console_handler)
         _logger.propagate = False
 
-    def __init__(self, aprsc, redis_conn, channels):
+    def __init__(self, aprsc, redis_conn, channels,
+                 flush_size=aprsgate.FLUSH_SIZE,
+                 flush_interval=aprsgate.FLUSH_INTERVAL):
         threading.Thread.__init__(self)
 
         self.aprsc = aprsc
         self.redis_conn = redis_conn
         self.channels = channels
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+
+        # Use the ',I' construct for APRS-IS, decided once per gate:
+        self.use_i_construct = getattr(aprsc, 'use_i_construct', False)
+        self._path_suffix = ',I' if self.use_i_construct else ''
+
+        # APRS-IS takes TNC2 lines, so those can be coalesced into one write:
+        self.coalesce = isinstance(aprsc, aprs.TCP)
+
+        self._buffer = []
+        self._buffer_size = 0
+        self._buffer_start = None
+
+        # Histogram of frames-per-flush, logged every FLUSH_STATS_INTERVAL:
+        self.flush_stats = collections.Counter()
+        self._stats_logged = time.time()
 
         self.pubsub = None
         self.daemon = True
@@ -105,15 +125,83 @@ class GateOut(threading.Thread):
         self._logger.debug('Handling message="%s"', message)
         if message.get('type') == 'message' and message.get('data'):
             message_data = message['data']
+
+            if self.coalesce:
+                self.buffer_frame(message_data)
+                return
+
             aprs_frame = aprs.Frame(message_data)
 
-            # Use the ',I' construct for APRS-IS:
-            if self.aprsc.use_i_construct:
+            if self.use_i_construct:
                 aprs_frame.path.append('I')
 
             self._logger.info('Sending aprs_frame="%s"', aprs_frame)
             self.aprsc.send(aprs_frame)
 
+    def buffer_frame(self, message_data):
+        """
+        Buffers a TNC2 frame as an APRS-IS line, flushing when full.
+        """
+        header, sep, info = str(message_data).partition(':')
+        if not sep:
+            self._logger.warning(
+                'Dropping malformed message_data="%s"', message_data)
+            return
+
+        line = ''.join([header, self._path_suffix, ':', info, '\r\n'])
+
+        self._logger.info('Buffering line="%s"', line.rstrip())
+
+        if not self._buffer:
+            self._buffer_start = time.time()
+
+        self._buffer.append(line)
+        self._buffer_size += len(line)
+
+        if self._buffer_size >= self.flush_size:
+            self.flush()
+
+    def flush_due(self):
+        """Checks if the oldest buffered line has waited long enough."""
+        return bool(self._buffer) and (
+            time.time() - self._buffer_start >= self.flush_interval)
+
+    def flush(self):
+        """
+        Sends all buffered lines to APRS-IS in a single write.
+
+        The buffer is cleared before writing, so lines from a failed write
+        are dropped rather than retried.
+        """
+        if not self._buffer:
+            return
+
+        lines = self._buffer
+        buffer_size = self._buffer_size
+
+        self._buffer = []
+        self._buffer_size = 0
+        self._buffer_start = None
+
+        try:
+            self.aprsc.interface.sendall(''.join(lines))
+        except Exception:
+            self._logger.error(
+                'Dropping frames=%s on failed write', len(lines))
+            raise
+
+        self.flush_stats[len(lines)] += 1
+
+        self._logger.debug(
+            'Flushed frames=%s bytes=%s', len(lines), buffer_size)
+
+    def log_flush_stats(self):
+        """Logs the frames-per-flush histogram."""
+        self._logger.info(
+            'Flush stats flushes=%s frames_per_flush=%s',
+            sum(self.flush_stats.values()), sorted(self.flush_stats.items()))
+        self._stats_logged = time.time()
+
     def run(self):
         self._logger.info('Running %s', self)
         self.pubsub = self.redis_conn.pubsub()
@@ -121,9 +209,28 @@ class GateOut(threading.Thread):
             'Subscribing to channels="%s"', self.channels)
         self.pubsub.subscribe(self.channels)
 
-        while not self.stopped():
-            for message in self.pubsub.listen():
-                self.handle_message(message)
+        if not self.coalesce:
+            while not self.stopped():
+                for message in self.pubsub.listen():
+                    self.handle_message(message)
+            return
+
+        try:
+            while not self.stopped():
+                message = self.pubsub.get_message(
+                    timeout=self.flush_interval)
+                if message:
+                    self.handle_message(message)
+                if self.flush_due():
+                    self.flush()
+                if (time.time() - self._stats_logged >=
+                        aprsgate.FLUSH_STATS_INTERVAL):
+                    self.log_flush_stats()
+        finally:
+            try:
+                self.flush()
+            finally:
+                self.log_flush_stats()
 
 
 class GateWorker(threading.Thread):
@@ -139,12 +246,26 @@ class GateWorker(threading.Thread):
         _logger.addHandler(_console_handler)
         _logger.propagate = False
 
-    def __init__(self, redis_conn, in_channels, out_channels):
+    def __init__(self, redis_conn, in_channels, out_channels,
+                 batch_size=None, batch_wait=aprsgate.BATCH_WAIT,
+                 batch_dedup=False):
         threading.Thread.__init__(self)
 
+        if batch_size is not None and batch_size < 0:
+            raise ValueError('batch_size must be >= 0: %s' % batch_size)
+        if batch_wait <= 0:
+            raise ValueError('batch_wait must be > 0: %s' % batch_wait)
+
         self.redis_conn = redis_conn
         self.in_channels = in_channels
         self.out_channels = out_channels
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self.batch_dedup = batch_dedup
+
+        # (channel, gate_id) pairs, split once rather than per frame:
+        self._out_gates = [
+            (channel, channel.split('_')[1]) for channel in out_channels]
 
         self.pubsub = None
         self.daemon = True
@@ -159,30 +280,115 @@ class GateWorker(threading.Thread):
         """Checks if the thread is stopped."""
         return self._stop.isSet()
 
-    def handle_message(self, message):
-        self._logger.debug('Handling message="%s"', message)
-        if message.get('type') == 'message' and message.get('data'):
-            message_data = message['data']
-            aprs_frame = aprs.Frame(message_data)
+    def route_frame(self, aprs_frame, publish):
+        """
+        Publishes a frame to each out channel using the given publish
+        callable, stopping at the first channel that would loop.
 
-            if aprsgate.reject_frame(aprs_frame):
-                return
+        Returns True if the frame was published to any channel.
+        """
+        if aprsgate.reject_frame(aprs_frame):
+            return False
+
+        published = False
+        path = set(str(frame_path) for frame_path in aprs_frame.path)
 
-            for channel in self.out_channels:
-                gate_dir, gate_id, gate_tag = channel.split('_')
+        for channel, gate_id in self._out_gates:
+            # Don't re-gate my own frames. (anti-loop)
+            if any(gate_id in frame_path for frame_path in path):
+                return published
 
-                # Don't re-gate my own frames. (anti-loop)
-                for frame_path in aprs_frame.path:
-                    if gate_id in str(frame_path):
-                        return
+            aprs_frame.path.append(aprs.Callsign(gate_id))
+            path.add(str(aprs_frame.path[-1]))
 
-                aprs_frame.path.append(aprs.Callsign(gate_id))
+            self._logger.debug(
+                'Sending to channel=%s frame="%s"',
+                channel, aprs_frame)
 
-                self._logger.debug(
-                    'Sending to channel=%s frame="%s"',
-                    channel, aprs_frame)
+            # Serialize now: a pipeline only stringifies args on execute(),
+            # after later channels have appended to the path.
+            publish(channel, str(aprs_frame))
+            published = True
 
-                self.redis_conn.publish(channel, aprs_frame)
+        return published
+
+    def handle_message(self, message):
+        self._logger.debug('Handling message="%s"', message)
+        if message.get('type') == 'message' and message.get('data'):
+            message_data = message['data']
+            aprs_frame = aprs.Frame(message_data)
+            self.route_frame(aprs_frame, self.redis_conn.publish)
+
+    def handle_batch(self, messages):
+        """
+        Routes a batch of PubSub messages, in arrival order, and sends
+        the results in one pipelined publish.
+
+        With batch_dedup, a frame whose source, destination and text match
+        an earlier published frame in the same batch is dropped, whatever
+        its path.
+        """
+        self._logger.debug('Handling batch of messages=%s', len(messages))
+
+        seen = set()
+        pipeline = self.redis_conn.pipeline(transaction=False)
+
+        for message in messages:
+            message_data = message.get('data')
+            if not message_data:
+                continue
+
+            dedup_key = None
+            if self.batch_dedup:
+                dedup_key = aprsgate.frame_key(message_data)
+                if dedup_key in seen:
+                    self._logger.debug(
+                        'Dropping duplicate message_data="%s"', message_data)
+                    continue
+
+            try:
+                aprs_frame = aprs.Frame(message_data)
+                published = self.route_frame(aprs_frame, pipeline.publish)
+            except Exception:  # pylint: disable=broad-except
+                self._logger.exception(
+                    'Skipping message_data="%s"', message_data)
+                continue
+
+            # Only a published copy claims the key, so a rejected or looped
+            # copy (e.g. from APRS-IS) doesn't hide a routable one.
+            if published and dedup_key is not None:
+                seen.add(dedup_key)
+
+        pipeline.execute()
+
+    def next_batch(self):
+        """
+        Drains up to batch_size messages, waiting no longer than
+        batch_wait after the first one arrives. Returns an empty batch if
+        nothing arrives within batch_wait.
+        """
+        batch = []
+        deadline = None
+
+        while len(batch) < self.batch_size and not self.stopped():
+            if deadline is None:
+                timeout = self.batch_wait
+            else:
+                timeout = deadline - time.time()
+                if timeout <= 0:
+                    break
+
+            message = self.pubsub.get_message(timeout=timeout)
+            if message is None and deadline is None:
+                break
+            if not message or message.get('type') != 'message':
+                continue
+
+            if deadline is None:
+                deadline = time.time() + self.batch_wait
+            batch.append(message)
+
+        return batch
 
     def run(self):
         self._logger.info('Running %s', self)
@@ -193,6 +399,16 @@ class GateWorker(threading.Thread):
             'Publishing to out_channels="%s"', self.out_channels)
         self.pubsub.subscribe(self.in_channels)
 
+        if self.batch_size:
+            self._logger.info(
+                'Batching batch_size=%s batch_wait=%s batch_dedup=%s',
+                self.batch_size, self.batch_wait, self.batch_dedup)
+            while not self.stopped():
+                batch = self.next_batch()
+                if batch:
+                    self.handle_batch(batch)
+            return
+
         while not self.stopped():
             for message in self.pubsub.listen():
                 self.handle_message(message)
@@ -6,9 +6,6 @@
 import argparse
 import time
 
-import aprs
-import redis
-
 import aprsgate
 
 __author__ = 'Greg Albrecht W2GMD <oss@undef.net>'
@@ -16,7 +13,13 @@ __copyright__ = 'Copyright 2016 Orion Labs, Inc.'
 __license__ = 'All rights reserved. Do not redistribute.'
 
 
+# redis and predict are imported inside the commands that use them, so
+# predict is only loaded by satbeacon, and -h or bad options skip redis.
+
+
 def start_aprsgate(aprsc, callsign, redis_server, tag):
+    import redis
+
     gate_in_channels = ['_'.join(['GateIn', callsign, tag])]
     gate_out_channels = ['_'.join(['GateOut', callsign, tag])]
 
@@ -30,6 +33,8 @@ def start_aprsgate(aprsc, callsign, redis_server, tag):
     thread_pool.append(
         aprsgate.GateOut(aprsc, redis_conn, gate_out_channels))
 
+    aprsgate.install_profiler()
+
     try:
         aprsc.start()
 
@@ -44,8 +49,9 @@ def start_aprsgate(aprsc, callsign, redis_server, tag):
         [th.stop() for th in thread_pool]
 
 
-def aprsgate_tcp():
-    parser = argparse.ArgumentParser()
+def aprsgate_tcp(argv=None, prog=None):
+    """Gates an APRS-IS (TCP) connection."""
+    parser = argparse.ArgumentParser(prog=prog)
 
     parser.add_argument(
         '-c', '--callsign', help='callsign', required=True
@@ -65,7 +71,9 @@ def aprsgate_tcp():
         default='p/RS0ISS u/ARISS/RS0ISS'
     )
 
-    opts = parser.parse_args()
+    opts = parser.parse_args(argv)
+
+    import aprs
 
     aprsc = aprs.TCP(
         opts.callsign,
@@ -76,8 +84,9 @@ def aprsgate_tcp():
     start_aprsgate(aprsc, opts.callsign, opts.redis_server, opts.tag)
 
 
-def aprsgate_kiss_serial():
-    parser = argparse.ArgumentParser()
+def aprsgate_kiss_serial(argv=None, prog=None):
+    """Gates a serial KISS TNC."""
+    parser = argparse.ArgumentParser(prog=prog)
 
     parser.add_argument(
         '-c', '--callsign', help='callsign', required=True
@@ -96,14 +105,17 @@ def aprsgate_kiss_serial():
         '-S', '--speed', help='speed', required=False, default=19200
     )
 
-    opts = parser.parse_args()
+    opts = parser.parse_args(argv)
+
+    import aprs
 
     aprsc = aprs.SerialKISS(opts.serial_port, opts.speed)
     start_aprsgate(aprsc, opts.callsign, opts.redis_server, opts.tag)
 
 
-def aprsgate_kiss_tcp():
-    parser = argparse.ArgumentParser()
+def aprsgate_kiss_tcp(argv=None, prog=None):
+    """Gates a TCP KISS TNC."""
+    parser = argparse.ArgumentParser(prog=prog)
 
     parser.add_argument(
         '-c', '--callsign', help='callsign', required=True
@@ -122,7 +134,9 @@ def aprsgate_kiss_tcp():
         '-P', '--port', help='TCP Port', required=False, default=8001
     )
 
-    opts = parser.parse_args()
+    opts = parser.parse_args(argv)
+
+    import aprs
 
     aprsc = aprs.TCPKISS(
         opts.host,
@@ -132,8 +146,9 @@ def aprsgate_kiss_tcp():
     start_aprsgate(aprsc, opts.callsign, opts.redis_server, opts.tag)
 
 
-def aprsgate_worker():
-    parser = argparse.ArgumentParser()
+def aprsgate_worker(argv=None, prog=None):
+    """Routes frames from GateIn to GateOut channels."""
+    parser = argparse.ArgumentParser(prog=prog)
 
     parser.add_argument(
         '-c', '--callsign', help='callsign', required=True
@@ -145,19 +160,44 @@ def aprsgate_worker():
         '-t', '--tag', help='Gate Tag', required=False, default='IGATE'
     )
 
-    opts = parser.parse_args()
+    parser.add_argument(
+        '-b', '--batch_size', help='Batch Size', required=False, default=0,
+        type=int
+    )
+    parser.add_argument(
+        '-w', '--batch_wait', help='Batch Wait', required=False,
+        default=aprsgate.BATCH_WAIT, type=float
+    )
+    parser.add_argument(
+        '-d', '--batch_dedup', help='Drop repeated frames within a batch',
+        required=False, default=False, action='store_true'
+    )
+
+    opts = parser.parse_args(argv)
+
+    if opts.batch_size < 0:
+        parser.error('--batch_size must be >= 0')
+    if opts.batch_wait <= 0:
+        parser.error('--batch_wait must be > 0')
 
     gate_in_channels = ['_'.join(['GateIn', opts.callsign, opts.tag])]
     gate_out_channels = ['_'.join(['GateOut', opts.callsign, opts.tag])]
 
+    import redis
+
     redis_conn = redis.StrictRedis(opts.redis_server)
 
     worker = aprsgate.GateWorker(
         redis_conn,
         in_channels=gate_in_channels,
-        out_channels=gate_out_channels
+        out_channels=gate_out_channels,
+        batch_size=opts.batch_size,
+        batch_wait=opts.batch_wait,
+        batch_dedup=opts.batch_dedup
     )
 
+    aprsgate.install_profiler()
+
     try:
         worker.start()
 
@@ -170,8 +210,9 @@ def aprsgate_worker():
         worker.stop()
 
 
-def aprsgate_beacon():
-    parser = argparse.ArgumentParser()
+def aprsgate_beacon(argv=None, prog=None):
+    """Beacons a frame at a fixed interval."""
+    parser = argparse.ArgumentParser(prog=prog)
 
     parser.add_argument(
         '-c', '--callsign', help='callsign', required=True
@@ -191,10 +232,12 @@ def aprsgate_beacon():
         type=int
     )
 
-    opts = parser.parse_args()
+    opts = parser.parse_args(argv)
 
     gate_out_channels = ['_'.join(['GateOut', opts.callsign, opts.tag])]
 
+    import redis
+
     redis_conn = redis.StrictRedis(opts.redis_server)
 
     beacon = aprsgate.GateBeacon(
@@ -204,6 +247,8 @@ def aprsgate_beacon():
         interval=opts.interval
     )
 
+    aprsgate.install_profiler()
+
     try:
         beacon.start()
 
@@ -216,10 +261,11 @@ def aprsgate_beacon():
         beacon.stop()
 
 
-def aprsgate_satbeacon():
+def aprsgate_satbeacon(argv=None, prog=None):
+    """Beacons a frame during satellite passes."""
     from aprsgate.sat import SatBeacon
 
-    parser = argparse.ArgumentParser()
+    parser = argparse.ArgumentParser(prog=prog)
 
     parser.add_argument(
         '-c', '--callsign', help='callsign', required=True
@@ -245,10 +291,12 @@ def aprsgate_satbeacon():
         '-Q', '--qth', help='QTH', required=False, default=aprsgate.QTH,
     )
 
-    opts = parser.parse_args()
+    opts = parser.parse_args(argv)
 
     gate_out_channels = ['_'.join(['GateOut', opts.callsign, opts.tag])]
 
+    import redis
+
     redis_conn = redis.StrictRedis(opts.redis_server)
 
     beacon = SatBeacon(
@@ -260,6 +308,8 @@ def aprsgate_satbeacon():
         qth=opts.qth
     )
 
+    aprsgate.install_profiler()
+
     try:
         beacon.start()
 
@@ -270,3 +320,40 @@ def aprsgate_satbeacon():
         beacon.stop()
     finally:
         beacon.stop()
+
+
+COMMANDS = {
+    'tcp': aprsgate_tcp,
+    'kiss_tcp': aprsgate_kiss_tcp,
+    'kiss_serial': aprsgate_kiss_serial,
+    'worker': aprsgate_worker,
+    'beacon': aprsgate_beacon,
+    'satbeacon': aprsgate_satbeacon,
+}
+
+
+def main(argv=None):
+    """
+    Multi-call entry point: `aprsgate <subcommand> [options]`.
+
+    Only the chosen subcommand's dependencies are imported.
+    """
+    parser = argparse.ArgumentParser(
+        prog='aprsgate',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='subcommands:\n%s' % '\n'.join(
+            '  %-12s %s' % (name, COMMANDS[name].__doc__)
+            for name in sorted(COMMANDS)))
+
+    parser.add_argument(
+        'subcommand', help='Subcommand', choices=sorted(COMMANDS)
+    )
+    parser.add_argument(
+        'args', help='Subcommand options, see: aprsgate <subcommand> -h',
+        nargs=argparse.REMAINDER
+    )
+
+    opts = parser.parse_args(argv)
+
+    COMMANDS[opts.subcommand](
+        opts.args, prog='aprsgate %s' % opts.subcommand)
@@ -25,3 +25,29 @@ QTH = (37.76, 122.4975, 56)
 BEACON_INTERVAL = 600
 
 REJECT_PATHS = set(['TCPIP', 'TCPIP*', 'NOGATE', 'RFONLY'])
+
+# Coalesced APRS-IS writes: flush once this many bytes are buffered...
+FLUSH_SIZE = 4096
+
+# ...or once the oldest buffered line is this many seconds old.
+FLUSH_INTERVAL = 0.1
+
+# How often, in seconds, GateOut logs its frames-per-flush histogram.
+FLUSH_STATS_INTERVAL = 300
+
+# GateWorker batch mode: longest a drained message waits for its batch.
+BATCH_WAIT = 0.05
+
+# On-demand profiler (send SIGUSR1 to a running gate to trigger):
+PROFILE_DURATION = 30
+PROFILE_INTERVAL = 0.005
+# (function name, top-level package) pairs counted by the profiler:
+PROFILE_FUNCTIONS = set([
+    ('handle_message', 'aprsgate'),
+    ('handle_batch', 'aprsgate'),
+    ('reject_frame', 'aprsgate'),
+    ('buffer_frame', 'aprsgate'),
+    ('flush', 'aprsgate'),
+    ('parse', 'aprs'),
+    ('publish', 'redis'),
+])
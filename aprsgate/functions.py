@@ -27,3 +27,13 @@ def reject_frame(aprs_frame):
             return True
 
     return False
+
+
+def frame_key(message_data):
+    """
+    Returns the (source, destination, text) of a TNC2 frame, ignoring its
+    path, so copies heard via different digipeaters compare equal.
+    """
+    header, _, text = str(message_data).partition(':')
+    source, _, destination = header.partition('>')
+    return (source, destination.split(',', 1)[0], text)
@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Python APRS Gateway Sampling Profiler."""
+
+import collections
+import logging
+import logging.handlers
+import os
+import signal
+import sys
+import tempfile
+import threading
+import time
+
+import aprsgate
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'
+__license__ = 'Apache License, Version 2.0'
+__copyright__ = 'Copyright 2016 Orion Labs, Inc.'
+
+
+class GateProfiler(threading.Thread):
+
+    """
+    Samples the stacks of all running Threads for a fixed duration and
+    writes them in collapsed-stack (flamegraph) format.
+    """
+
+    _logger = logging.getLogger(__name__)
+    if not _logger.handlers:
+        _logger.setLevel(aprsgate.LOG_LEVEL)
+        _console_handler = logging.StreamHandler()
+        _console_handler.setLevel(aprsgate.LOG_LEVEL)
+        _console_handler.setFormatter(aprsgate.LOG_FORMAT)
+        _logger.addHandler(_console_handler)
+        _logger.propagate = False
+
+    def __init__(self, duration=aprsgate.PROFILE_DURATION,
+                 interval=aprsgate.PROFILE_INTERVAL, output_dir=None):
+        threading.Thread.__init__(self)
+
+        self.duration = duration
+        self.interval = interval
+        self.output_dir = output_dir or tempfile.gettempdir()
+
+        self.stacks = collections.Counter()
+        self.function_counts = collections.Counter()
+        self.samples = 0
+
+        self.daemon = True
+
+        self._stop = threading.Event()
+
+    def stop(self):
+        """Stop the thread at the next opportunity."""
+        self._stop.set()
+
+    def stopped(self):
+        """Checks if the thread is stopped."""
+        return self._stop.isSet()
+
+    def sample(self):
+        """Records one stack sample for every other running Thread."""
+        thread_names = dict(
+            (th.ident, th.name) for th in threading.enumerate())
+
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == self.ident:
+                continue
+
+            stack = []
+            functions = set()
+            while frame is not None:
+                code = frame.f_code
+                stack.append('%s (%s)' % (
+                    code.co_name, os.path.basename(code.co_filename)))
+                package = frame.f_globals.get('__name__', '').split('.')[0]
+                functions.add((code.co_name, package))
+                frame = frame.f_back
+
+            stack.append(thread_names.get(thread_id, str(thread_id)))
+            stack.reverse()
+            self.stacks[';'.join(stack)] += 1
+
+            for function in functions & aprsgate.PROFILE_FUNCTIONS:
+                self.function_counts['.'.join(reversed(function))] += 1
+
+        self.samples += 1
+
+    def write(self):
+        """Writes collapsed stacks to output_dir, returns the file path."""
+        output_file = os.path.join(
+            self.output_dir,
+            'aprsgate-%s-%s.folded' % (os.getpid(), int(time.time())))
+
+        with open(output_file, 'w') as output:
+            for stack, count in sorted(self.stacks.items()):
+                output.write('%s %s\n' % (stack, count))
+
+        return output_file
+
+    def run(self):
+        self._logger.info(
+            'Profiling for duration=%s interval=%s',
+            self.duration, self.interval)
+
+        end = time.time() + self.duration
+        while not self.stopped() and time.time() < end:
+            self.sample()
+            time.sleep(self.interval)
+
+        output_file = self.write()
+        self._logger.info(
+            'Wrote samples=%s to output_file="%s"', self.samples, output_file)
+        for func_name, count in self.function_counts.most_common():
+            self._logger.info(
+                'Profile function=%s samples=%s', func_name, count)
+
+
+def install_profiler(signum=getattr(signal, 'SIGUSR1', None),
+                     duration=aprsgate.PROFILE_DURATION,
+                     interval=aprsgate.PROFILE_INTERVAL, output_dir=None):
+    """
+    Installs a signal handler that starts a GateProfiler on demand.
+
+    Nothing is sampled until the signal arrives, and a signal received
+    while a profile is already running is ignored. Does nothing on
+    platforms without the signal (e.g. SIGUSR1 on Windows).
+    """
+    if signum is None:
+        GateProfiler._logger.debug('No profiler signal on this platform')
+        return
+
+    state = {'profiler': None}
+
+    def _handler(_signum, _frame):
+        profiler = state['profiler']
+        if profiler is not None and profiler.is_alive():
+            return
+        state['profiler'] = GateProfiler(duration, interval, output_dir)
+        state['profiler'].start()
+
+    signal.signal(signum, _handler)
@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Startup Benchmark for the Python APRS Gateway.
+
+Runs each subcommand through aprsgate.cmd.main() in a fresh interpreter
+and stops it at install_profiler(), the last step every command takes
+before connecting or starting threads. Reports the wall time to get there
+(imports, argument parsing, setup) and the resulting max RSS.
+"""
+
+import subprocess
+import sys
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'
+__license__ = 'Apache License, Version 2.0'
+__copyright__ = 'Copyright 2016 Orion Labs, Inc.'
+
+
+# Minimal options each subcommand requires; nothing is connected to.
+SUBCOMMAND_ARGS = {
+    'tcp': ['-c', 'N0CALL', '-r', 'localhost', '-p', '-1'],
+    'kiss_tcp': ['-c', 'N0CALL', '-r', 'localhost', '-H', 'localhost'],
+    'kiss_serial': ['-c', 'N0CALL', '-r', 'localhost', '-s', '/dev/null'],
+    'worker': ['-c', 'N0CALL', '-r', 'localhost'],
+    'beacon': ['-c', 'N0CALL', '-r', 'localhost', '-f', 'N0CALL>APRS:>'],
+    'satbeacon': ['-c', 'N0CALL', '-r', 'localhost', '-f', 'N0CALL>APRS:>'],
+}
+
+PROBE = """
+import resource, sys, time
+start = time.time()
+
+import aprsgate
+import aprsgate.cmd
+
+
+class Started(Exception):
+    pass
+
+
+def install_profiler(*args, **kwargs):
+    raise Started()
+
+
+aprsgate.install_profiler = install_profiler
+
+try:
+    aprsgate.cmd.main(sys.argv[1:])
+except Started:
+    pass
+else:
+    sys.exit('subcommand returned before install_profiler()')
+
+elapsed = time.time() - start
+max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+sys.stdout.write('%.1f %d' % (elapsed * 1000, max_rss))
+"""
+
+RUNS = 5
+
+
+def measure(argv):
+    """Returns the best (startup_ms, max_rss_kb) over RUNS fresh processes."""
+    results = []
+    for _ in range(RUNS):
+        output = subprocess.check_output([sys.executable, '-c', PROBE] + argv)
+        startup_ms, max_rss = output.split()
+        results.append((float(startup_ms), int(max_rss)))
+    return min(results)
+
+
+def main():
+    print('%-12s %10s %12s' % ('subcommand', 'startup_ms', 'max_rss_kb'))
+    for subcommand in sorted(SUBCOMMAND_ARGS):
+        try:
+            startup_ms, max_rss = measure(
+                [subcommand] + SUBCOMMAND_ARGS[subcommand])
+        except subprocess.CalledProcessError:
+            print('%-12s %10s %12s' % (subcommand, 'error', '-'))
+            continue
+        print('%-12s %10.1f %12d' % (subcommand, startup_ms, max_rss))
+
+
+if __name__ == '__main__':
+    main()
@@ -51,6 +51,7 @@ setuptools.setup(
     install_requires=['aprs >= 6.0.0', 'kiss >= 6.0.0'],
     entry_points={
         'console_scripts': [
+            'aprsgate = aprsgate.cmd:main',
             'aprsgate_tcp = aprsgate.cmd:aprsgate_tcp',
             'aprsgate_kiss_tcp = aprsgate.cmd:aprsgate_kiss_tcp',
             'aprsgate_kiss_serial = aprsgate.cmd:aprsgate_kiss_serial',
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for Python APRS Gateway GateOut."""
+
+import socket
+import unittest
+
+import aprs
+
+import aprsgate
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'
+__license__ = 'Apache License, Version 2.0'
+__copyright__ = 'Copyright 2016 Orion Labs, Inc.'
+
+
+class FakeSocket(object):
+
+    """Records sendall() writes, optionally failing them."""
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.writes = []
+
+    def sendall(self, data):
+        self.writes.append(data)
+        if self.fail:
+            raise socket.error('write failed')
+
+
+class FakeTCP(aprs.TCP):
+
+    """An APRS-IS connection that is never started."""
+
+    def __init__(self, interface):  # pylint: disable=super-init-not-called
+        self.use_i_construct = True
+        self.interface = interface
+
+
+class GateOutTestCase(unittest.TestCase):
+
+    """Tests for GateOut's coalesced APRS-IS writes."""
+
+    def _gate(self, interface, **kwargs):
+        return aprsgate.GateOut(
+            FakeTCP(interface), None, ['GateOut_AAA_IGATE'], **kwargs)
+
+    def test_coalesced_lines(self):
+        """Lines get the ',I' construct and CRLF, in a single write."""
+        interface = FakeSocket()
+        gate = self._gate(interface)
+        self.assertTrue(gate.coalesce)
+
+        gate.buffer_frame('N0CALL>APRS,WIDE1-1,AAA:hello')
+        gate.buffer_frame('N0CALL>APRS:x')
+        self.assertEqual([], interface.writes)
+
+        gate.flush()
+        self.assertEqual(
+            ['N0CALL>APRS,WIDE1-1,AAA,I:hello\r\nN0CALL>APRS,I:x\r\n'],
+            interface.writes)
+        self.assertEqual({2: 1}, dict(gate.flush_stats))
+
+    def test_flush_at_flush_size(self):
+        """Reaching flush_size bytes flushes without waiting."""
+        interface = FakeSocket()
+        gate = self._gate(interface, flush_size=20)
+
+        gate.buffer_frame('N0CALL>APRS:1')
+        self.assertEqual([], interface.writes)
+        gate.buffer_frame('N0CALL>APRS:2')
+        self.assertEqual(1, len(interface.writes))
+        self.assertFalse(gate.flush_due())
+
+    def test_flush_due(self):
+        """Buffered lines are due once flush_interval has passed."""
+        gate = self._gate(FakeSocket(), flush_interval=0)
+        self.assertFalse(gate.flush_due())
+        gate.buffer_frame('N0CALL>APRS:x')
+        self.assertTrue(gate.flush_due())
+
+    def test_malformed_dropped(self):
+        """Messages without a ':' are never sent."""
+        interface = FakeSocket()
+        gate = self._gate(interface)
+
+        gate.buffer_frame('BAD')
+        gate.flush()
+        self.assertEqual([], interface.writes)
+
+    def test_failed_write_not_retried(self):
+        """A failed sendall() drops its lines instead of resending them."""
+        interface = FakeSocket(fail=True)
+        gate = self._gate(interface)
+
+        gate.buffer_frame('N0CALL>APRS:x')
+        self.assertRaises(socket.error, gate.flush)
+        gate.flush()
+        self.assertEqual(1, len(interface.writes))
+        self.assertEqual({}, dict(gate.flush_stats))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for Python APRS Gateway GateWorker."""
+
+import collections
+import time
+import unittest
+
+import aprs
+
+import aprsgate
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'
+__license__ = 'Apache License, Version 2.0'
+__copyright__ = 'Copyright 2016 Orion Labs, Inc.'
+
+
+class FakePipeline(object):
+
+    """Queues publish args and only sends them on execute(), like redis."""
+
+    def __init__(self, redis_conn):
+        self.redis_conn = redis_conn
+        self.queued = []
+
+    def publish(self, channel, message):
+        self.queued.append((channel, message))
+
+    def execute(self):
+        for channel, message in self.queued:
+            self.redis_conn.publish(channel, message)
+        self.queued = []
+
+
+class FakeRedis(object):
+
+    """Records published messages as redis would send them (str)."""
+
+    def __init__(self):
+        self.published = []
+
+    def publish(self, channel, message):
+        self.published.append((channel, str(message)))
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePubSub(object):
+
+    """Returns queued messages, waiting out the timeout when empty."""
+
+    def __init__(self, messages, delay=0):
+        self.messages = collections.deque(messages)
+        self.delay = delay
+
+    def get_message(self, timeout=0):
+        if self.messages:
+            time.sleep(self.delay)
+            return self.messages.popleft()
+        time.sleep(timeout)
+        return None
+
+
+class GateWorkerTestCase(unittest.TestCase):
+
+    """Tests for GateWorker per-message and batch modes."""
+
+    in_channels = ['GateIn_N0CALL_IGATE']
+    out_channels = ['GateOut_AAA_IGATE', 'GateOut_BBB_IGATE']
+
+    frames = [
+        'N0CALL>APRS,WIDE1-1:hello',
+        'N0CALL>APRS,WIDE2-1:hello',
+        'N0CALL-1>APRS,AAA:looped',
+        'N0CALL-2>APRS,TCPIP*:internet',
+        'N0CALL-3>APRS:>status',
+    ]
+
+    def _worker(self, **kwargs):
+        redis_conn = FakeRedis()
+        worker = aprsgate.GateWorker(
+            redis_conn, self.in_channels, self.out_channels, **kwargs)
+        return worker, redis_conn
+
+    def _messages(self, frames):
+        return [{'type': 'message', 'data': frame} for frame in frames]
+
+    def test_batch_matches_per_message(self):
+        """Batch mode publishes exactly what per-message mode does."""
+        worker, single_redis = self._worker()
+        for message in self._messages(self.frames):
+            worker.handle_message(message)
+
+        worker, batch_redis = self._worker(batch_size=10)
+        worker.handle_batch(self._messages(self.frames))
+
+        self.assertEqual(single_redis.published, batch_redis.published)
+        self.assertIn(
+            ('GateOut_AAA_IGATE', 'N0CALL>APRS,WIDE1-1,AAA:hello'),
+            batch_redis.published)
+        self.assertIn(
+            ('GateOut_BBB_IGATE', 'N0CALL>APRS,WIDE1-1,AAA,BBB:hello'),
+            batch_redis.published)
+
+    def test_batch_dedup(self):
+        """batch_dedup drops frames differing only by path."""
+        worker, redis_conn = self._worker(batch_size=10, batch_dedup=True)
+        worker.handle_batch(self._messages(self.frames))
+
+        hellos = [message for _, message in redis_conn.published
+                  if message.endswith(':hello')]
+        self.assertEqual(
+            ['N0CALL>APRS,WIDE1-1,AAA:hello',
+             'N0CALL>APRS,WIDE1-1,AAA,BBB:hello'],
+            hellos)
+
+    def test_batch_dedup_after_rejected_copy(self):
+        """A rejected copy doesn't hide a later routable one."""
+        frames = ['N0CALL>APRS,qAR,W1ABC:hello', 'N0CALL>APRS,WIDE1-1:hello']
+
+        worker, single_redis = self._worker()
+        for message in self._messages(frames):
+            worker.handle_message(message)
+
+        worker, batch_redis = self._worker(batch_size=10, batch_dedup=True)
+        worker.handle_batch(self._messages(frames))
+
+        self.assertEqual(single_redis.published, batch_redis.published)
+        self.assertIn(
+            ('GateOut_AAA_IGATE', 'N0CALL>APRS,WIDE1-1,AAA:hello'),
+            batch_redis.published)
+
+    def test_invalid_batch_args(self):
+        """Negative batch_size and non-positive batch_wait are rejected."""
+        self.assertRaises(ValueError, self._worker, batch_size=-1)
+        self.assertRaises(ValueError, self._worker, batch_wait=0)
+
+    def test_next_batch_size_cap(self):
+        """next_batch returns at most batch_size messages."""
+        worker, _ = self._worker(batch_size=3, batch_wait=0.1)
+        worker.pubsub = FakePubSub(self._messages(self.frames))
+
+        self.assertEqual(
+            self._messages(self.frames[:3]), worker.next_batch())
+        self.assertEqual(
+            self._messages(self.frames[3:]), worker.next_batch())
+
+    def test_next_batch_wait_deadline(self):
+        """next_batch returns batch_wait after the first message."""
+        worker, _ = self._worker(batch_size=100, batch_wait=0.05)
+        worker.pubsub = FakePubSub(
+            self._messages(self.frames * 20), delay=0.01)
+
+        start = time.time()
+        batch = worker.next_batch()
+        elapsed = time.time() - start
+
+        self.assertTrue(0 < len(batch) < 100)
+        self.assertTrue(elapsed < 0.5, elapsed)
+
+    def test_next_batch_idle(self):
+        """An idle next_batch waits, then returns an empty batch."""
+        worker, _ = self._worker(batch_size=10, batch_wait=0.05)
+        worker.pubsub = FakePubSub([])
+
+        start = time.time()
+        self.assertEqual([], worker.next_batch())
+        self.assertTrue(time.time() - start >= 0.05)
+
+    def test_batch_skips_bad_frame(self):
+        """A frame that fails to parse does not discard the batch."""
+        real_frame = aprs.Frame
+
+        def frame(message_data):
+            if message_data == 'BAD':
+                raise ValueError(message_data)
+            return real_frame(message_data)
+
+        worker, redis_conn = self._worker(batch_size=10)
+        aprs.Frame = frame
+        try:
+            worker.handle_batch(
+                self._messages(['BAD', 'N0CALL-3>APRS:>status']))
+        finally:
+            aprs.Frame = real_frame
+
+        self.assertEqual(2, len(redis_conn.published))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for Python APRS Gateway GateProfiler."""
+
+import os
+import re
+import shutil
+import signal
+import tempfile
+import threading
+import unittest
+
+import aprsgate
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'
+__license__ = 'Apache License, Version 2.0'
+__copyright__ = 'Copyright 2016 Orion Labs, Inc.'
+
+
+class BlockingAPRS(object):
+
+    """An APRS connection whose send() blocks until released."""
+
+    use_i_construct = False
+
+    def __init__(self):
+        self.sending = threading.Event()
+        self.release = threading.Event()
+
+    def send(self, frame):
+        self.sending.set()
+        self.release.wait(10)
+
+
+class GateProfilerTestCase(unittest.TestCase):
+
+    """Tests for GateProfiler sampling and output."""
+
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+        self.aprsc = BlockingAPRS()
+        gate = aprsgate.GateOut(self.aprsc, None, ['GateOut_AAA_IGATE'])
+
+        # Block a thread inside GateOut.handle_message:
+        self.thread = threading.Thread(
+            target=gate.handle_message,
+            args=({'type': 'message', 'data': 'N0CALL>APRS:x'},),
+            name='GateOutTest')
+        self.thread.daemon = True
+        self.thread.start()
+        self.assertTrue(self.aprsc.sending.wait(10))
+
+    def tearDown(self):
+        self.aprsc.release.set()
+        self.thread.join(10)
+        shutil.rmtree(self.output_dir)
+
+    def test_sample_and_write(self):
+        """Samples are written as 'thread;frame;... count' lines."""
+        profiler = aprsgate.GateProfiler(output_dir=self.output_dir)
+        profiler.sample()
+        profiler.sample()
+
+        self.assertEqual(2, profiler.samples)
+        self.assertEqual(
+            2, profiler.function_counts['aprsgate.handle_message'])
+
+        output_file = profiler.write()
+        self.assertEqual(self.output_dir, os.path.dirname(output_file))
+        self.assertTrue(output_file.endswith('.folded'))
+
+        with open(output_file) as output:
+            lines = output.read().splitlines()
+
+        for line in lines:
+            self.assertTrue(re.match(r'^[^;]+(;[^;]+)+ \d+$', line), line)
+
+        gate_lines = [
+            line for line in lines if line.startswith('GateOutTest;')]
+        self.assertEqual(1, len(gate_lines))
+        self.assertIn(';handle_message (classes.py);', gate_lines[0])
+        self.assertTrue(gate_lines[0].endswith(' 2'))
+
+    def test_install_profiler_without_signal(self):
+        """install_profiler(signum=None) installs nothing."""
+        if hasattr(signal, 'SIGUSR1'):
+            handler = signal.getsignal(signal.SIGUSR1)
+            aprsgate.install_profiler(signum=None)
+            self.assertEqual(handler, signal.getsignal(signal.SIGUSR1))
+        else:
+            aprsgate.install_profiler(signum=None)
+
+
+if __name__ == '__main__':
+    unittest.main()